@@ -14,7 +14,45 @@ def line_sphere_intersection(p1, p2, c, r):
         intersection formula, as a np.float64 scalar
     """
     # FILL in your code here
-    u_ = (p2 - p1) / np.linalg.norm(p2 - p1)
-    dis = np.dot(u_, (p1 - c))**2 - (np.linalg.norm(p1 - c)**2 - r**2)
-    
-    return -dis
\ No newline at end of file
+    # The unit direction (p2 - p1) / |p2 - p1| only appears squared inside the
+    # dot product, so the normalization folds into a single division by d.d
+    # and no square root is needed.
+    p1x, p1y, p1z = p1
+    p2x, p2y, p2z = p2
+    cx, cy, cz = c
+    dx, dy, dz = p2x - p1x, p2y - p1y, p2z - p1z
+    fx, fy, fz = p1x - cx, p1y - cy, p1z - cz
+
+    dd = dx*dx + dy*dy + dz*dz
+    df = dx*fx + dy*fy + dz*fz
+    ff = fx*fx + fy*fy + fz*fz
+    dis = df*df / dd - (ff - r*r)
+
+    return -dis
+
+
+def line_sphere_intersection_batch(P1, P2, C, r):
+    """
+    Vectorized line_sphere_intersection over many segments and spheres.
+
+    :param P1: starts of the line segments, shape (N, 3)
+    :param P2: ends of the line segments, shape (N, 3)
+    :param C: sphere centers, shape (M, 3)
+    :param r: sphere radii, shape (M,)
+    :returns: (N, M) np.float64 array whose [n, m] entry equals
+        line_sphere_intersection(P1[n], P2[n], C[m], r[m])
+    """
+    P1 = np.asarray(P1, dtype=np.float64)
+    P2 = np.asarray(P2, dtype=np.float64)
+    C = np.asarray(C, dtype=np.float64)
+    r = np.asarray(r, dtype=np.float64)
+
+    d = P2 - P1
+    f = P1[:, None, :] - C[None, :, :]
+
+    dd = np.einsum('ij,ij->i', d, d)
+    df = np.einsum('nmk,nk->nm', f, d)
+    ff = np.einsum('nmk,nmk->nm', f, f)
+    dis = df*df / dd[:, None] - (ff - r[None, :]**2)
+
+    return -dis
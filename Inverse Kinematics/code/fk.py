@@ -1,6 +1,8 @@
-import numpy as np
+import functools
 from math import cos, sin
 
+import numpy as np
+
 
 def fk(angles, link_lengths):
     """
@@ -22,19 +24,61 @@ def fk(angles, link_lengths):
         np.float64
     """
     # FILL in your code here
-    x = 0
-    y = 0
-    for i in range(len(angles)):
-        sub_arr = angles[0:i+1]
-        x += link_lengths[i] * cos(sum(sub_arr))
-        y += link_lengths[i] * sin(sum(sub_arr))
-        z = 0
-    
-    res = np.array([x, y, z])
-    
+    angles = np.asarray(angles, dtype=np.float64)
+    link_lengths = np.asarray(link_lengths, dtype=np.float64)
+
+    # absolute orientation of each link is the running sum of joint angles
+    cum = np.cumsum(angles)
+    x = np.dot(link_lengths, np.cos(cum))
+    y = np.dot(link_lengths, np.sin(cum))
+
+    res = np.array([x, y, 0.0])
+
     return res
 
 
+@functools.lru_cache(maxsize=16)
+def make_fk(n):
+    """
+    Builds a forward kinematics function specialized for an n-joint arm.
+
+    The returned function takes the same arguments as fk, but the loop over
+    the joints is unrolled at generation time and the running link
+    orientation is chained with the angle-addition identities, so each call
+    is a straight line of scalar trig.
+
+    :param n: number of joints (and links) of the arm; must be >= 0.
+    :returns: a function fk_n(angles, link_lengths) equivalent to fk for
+        inputs of length n.
+    """
+    if n < 0:
+        raise ValueError("make_fk needs a non-negative joint count, got {}"
+                         .format(n))
+
+    lines = ["def fk_{}(a, l):".format(n)]
+    if n == 0:
+        # a zero-joint arm has its end effector at the base, as in fk
+        lines += ["    x = 0.0",
+                  "    y = 0.0"]
+    else:
+        lines += ["    c0 = cos(a[0])",
+                  "    s0 = sin(a[0])",
+                  "    x = l[0]*c0",
+                  "    y = l[0]*s0"]
+    for i in range(1, n):
+        lines += ["    ci = cos(a[{i}])".format(i=i),
+                  "    si = sin(a[{i}])".format(i=i),
+                  "    c{i} = c{j}*ci - s{j}*si".format(i=i, j=i-1),
+                  "    s{i} = s{j}*ci + c{j}*si".format(i=i, j=i-1),
+                  "    x += l[{i}]*c{i}".format(i=i),
+                  "    y += l[{i}]*s{i}".format(i=i)]
+    lines.append("    return array((x, y, 0.0))")
+
+    namespace = {'cos': cos, 'sin': sin, 'array': np.array}
+    exec("\n".join(lines), namespace)
+    return namespace['fk_{}'.format(n)]
+
+
 if __name__ == '__main__':
     np.set_printoptions(suppress=True)
 
@@ -3,12 +3,15 @@ from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 from scipy.optimize import minimize
 
-from fk import fk
+from fk import fk, make_fk
 
 
 # arm link lengths
 link_lengths = np.array([0.7, 1.0, 1.0])
 
+# forward kinematics specialized for this arm
+arm_fk = make_fk(len(link_lengths))
+
 # joint angle limits
 bounds = [(-np.pi, np.pi)] * 3
 
@@ -28,7 +31,7 @@ def objective(x):
         cost for x
     """
     # FILL in your code here
-    p = fk(x, link_lengths)
+    p = arm_fk(x, link_lengths)
     return np.sum((p - p_d)**2)
 
 def solve_ik(obj, q0, bnds):
@@ -1,14 +1,147 @@
 #!/usr/bin/env python
 #test2
 import argparse
+import collections
+import functools
 # from hashlib import new
 # from operator import ne
+import logging
 import time
 
 import adapy
 import numpy as np
 import rospy
-import copy
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit that leaves functions uncompiled.
+        """
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+logger = logging.getLogger(__name__)
+
+# arm configurations used by main()
+ARM_HOME = np.array([-1.5, 3.22, 1.23, -2.19, 1.8, 1.2], dtype=np.float64)
+GOAL_CONFIG = np.array([-1.72, 4.44, 2.02, -2.04, 2.66, 1.39],
+                       dtype=np.float64)
+
+
+@functools.lru_cache(maxsize=None)
+def _bisection_order(n):
+    """
+    :param n: number of states along an edge.
+    :returns: int array permuting range(n) so the last state comes first,
+        followed by the midpoint of the rest, then the midpoints of the two
+        halves, and so on.
+    """
+    order = [n - 1]
+    intervals = collections.deque([(0, n - 2)])
+    while intervals:
+        lo, hi = intervals.popleft()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        order.append(mid)
+        intervals.append((lo, mid - 1))
+        intervals.append((mid + 1, hi))
+    return np.array(order)
+
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _nearest_index(states, sample):
+        """
+        :param states: (N, dim) array of node states, N > 0.
+        :param sample: np.array of the target point.
+        :returns: index of the row of states closest to sample and its
+            squared distance.
+        """
+        nearest_index = 0
+        min_dist_sq = np.inf
+        for i in range(states.shape[0]):
+            dist_sq = 0.0
+            for j in range(states.shape[1]):
+                d = states[i, j] - sample[j]
+                dist_sq += d * d
+            if dist_sq < min_dist_sq:
+                nearest_index = i
+                min_dist_sq = dist_sq
+        return nearest_index, min_dist_sq
+else:
+    def _nearest_index(states, sample):
+        """
+        :param states: (N, dim) array of node states, N > 0.
+        :param sample: np.array of the target point.
+        :returns: index of the row of states closest to sample and its
+            squared distance.
+        """
+        diff = states - sample
+        dist_sq = np.einsum('ij,ij->i', diff, diff)
+        i = int(np.argmin(dist_sq))
+        return i, dist_sq[i]
+
+
+@njit(cache=True)
+def _steer(state_from, state_to, step_size, out):
+    """
+    Writes the state at most step_size away from state_from on the segment
+    to state_to into out. out must not alias state_from.
+
+    :param state_from: np.array of the state to steer from.
+    :param state_to: np.array of the state to steer towards.
+    :param step_size: maximum distance to move.
+    :param out: np.array receiving the new state.
+    :returns: the squared distance between state_from and state_to.
+    """
+    dist_sq = 0.0
+    for j in range(state_from.shape[0]):
+        d = state_to[j] - state_from[j]
+        dist_sq += d * d
+    if dist_sq <= step_size * step_size:
+        out[:] = state_to
+        return dist_sq
+
+    # the square root is only needed when the step has to be shortened
+    scale = step_size / np.sqrt(dist_sq)
+    for j in range(state_from.shape[0]):
+        out[j] = state_from[j] + scale * (state_to[j] - state_from[j])
+    return dist_sq
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _steer6(state_from, state_to, step_size, out):
+    """
+    _steer unrolled for the 6-DOF arm.
+    """
+    d0 = state_to[0] - state_from[0]
+    d1 = state_to[1] - state_from[1]
+    d2 = state_to[2] - state_from[2]
+    d3 = state_to[3] - state_from[3]
+    d4 = state_to[4] - state_from[4]
+    d5 = state_to[5] - state_from[5]
+    dist_sq = d0*d0 + d1*d1 + d2*d2 + d3*d3 + d4*d4 + d5*d5
+    if dist_sq <= step_size * step_size:
+        scale = 1.0
+    else:
+        scale = step_size / np.sqrt(dist_sq)
+    out[0] = state_from[0] + scale * d0
+    out[1] = state_from[1] + scale * d1
+    out[2] = state_from[2] + scale * d2
+    out[3] = state_from[3] + scale * d3
+    out[4] = state_from[4] + scale * d4
+    out[5] = state_from[5] + scale * d5
+    return dist_sq
 
 
 class AdaRRT():
@@ -17,43 +150,126 @@ class AdaRRT():
     """
     joint_lower_limits = np.array([-3.14, 1.57, 0.33, -3.14, 0, 0])
     joint_upper_limits = np.array([3.14, 5.00, 5.00, 3.14, 3.14, 3.14])
+    sample_batch_size = 4096
 
-    class Node():
+    class Tree():
         """
-        A node for a doubly-linked tree structure.
+        A tree of states stored as contiguous arrays.
+
+        Nodes are referred to by index: node i has state states[i] and parent
+        parents[i], where the root's parent is -1. Only the first count rows
+        of the arrays are in use.
         """
-        def __init__(self, state, parent):
+        # smallest tree the k-d tree is built for. Below it a single query
+        # costs more in cKDTree.query's call overhead than a linear scan of
+        # every node; on 6-D RRT-grown trees the two break even at ~4000
+        # nodes with the numba scan (~28 us per query) and ~1000 nodes with
+        # the numpy scan (~25 us)
+        kdtree_min_size = 4096 if _HAVE_NUMBA else 1024
+
+        def __init__(self, root_state):
             """
-            :param state: np.array of a state in the search space.
-            :param parent: parent Node object.
+            :param root_state: np.array of the root's state in the search
+                space.
             """
-            self.state = np.asarray(state)
-            self.parent = parent
-            self.children = []
+            # k-d tree over the first self._kdtree_size states; it is built
+            # once the tree reaches kdtree_min_size and rebuilt whenever the
+            # tree has doubled since the last build, and nodes added in
+            # between are scanned linearly
+            self._kdtree = None
+            self._kdtree_size = 0
+
+            self.states = np.empty((64, root_state.shape[0]))
+            self.parents = np.empty(64, dtype=np.int32)
+            self.count = 0
+            self.add_node(root_state, -1)
+
+        def __len__(self):
+            return self.count
+
+        def add_node(self, state, parent_index):
+            """
+            Adds a new node at the given state, doubling the arrays when they
+            are full.
 
-        def __iter__(self):
+            :param state: np.array of the new node's state. It may be the row
+                returned by next_state, in which case no copy is made.
+            :param parent_index: index of the parent node, or -1 for the root.
+            :returns: index of the new node.
             """
-            Breadth-first iterator.
+            self.next_state()
+            index = self.count
+            self.states[index] = state
+            self.parents[index] = parent_index
+            self.count += 1
+            return index
+
+        def next_state(self):
             """
-            nodelist = [self]
-            while nodelist:
-                node = nodelist.pop(0)
-                nodelist.extend(node.children)
-                yield node
+            Returns the row of states the next add_node call will fill,
+            doubling the arrays when they are full. A candidate state can be
+            written straight into it and then passed to add_node.
 
-        def __repr__(self):
-            return 'Node({})'.format(', '.join(map(str, self.state)))
+            :returns: np.array view of the next free row of states.
+            """
+            if self.count == self.states.shape[0]:
+                capacity = 2 * self.count
+                self.states = np.resize(
+                    self.states, (capacity, self.states.shape[1]))
+                self.parents = np.resize(self.parents, capacity)
+            return self.states[self.count]
+
+        def path_to(self, index):
+            """
+            Traces the path from the root to a node.
 
-        def add_child(self, state):
+            :param index: index of the node at the end of the path.
+            :returns: A (length, dim) array of states beginning at the root.
+            """
+            # count the path length first so the path can be filled back to
+            # front
+            length = 0
+            i = index
+            while i != -1:
+                length += 1
+                i = self.parents[i]
+
+            path = np.empty((length, self.states.shape[1]))
+            i = index
+            for k in range(length - 1, -1, -1):
+                path[k] = self.states[i]
+                i = self.parents[i]
+
+            return path
+
+        def nearest(self, sample):
             """
-            Adds a new child at the given state.
+            Finds the closest node to the given sample, querying the k-d tree
+            and linearly scanning its unindexed tail. Small trees are only
+            scanned linearly.
 
-            :param state: np.array of new child node's state
-            :returns: child Node object.
+            :param sample: The target point to find the closest neighbor to.
+            :returns: index of the closest node.
             """
-            child = AdaRRT.Node(state=state, parent=self)
-            self.children.append(child)
-            return child
+            if self.count >= max(2 * self._kdtree_size,
+                                 AdaRRT.Tree.kdtree_min_size):
+                self._kdtree = cKDTree(self.states[:self.count])
+                self._kdtree_size = self.count
+
+            nearest_index = -1
+            min_dist_sq = float('inf')
+            if self._kdtree is not None:
+                dist, nearest_index = self._kdtree.query(sample)
+                min_dist_sq = dist * dist
+
+            # nodes added since the last rebuild are not in the k-d tree yet
+            if self._kdtree_size < self.count:
+                i, dist_sq = _nearest_index(
+                    self.states[self._kdtree_size:self.count], sample)
+                if dist_sq < min_dist_sq:
+                    nearest_index = self._kdtree_size + i
+
+            return nearest_index
 
     def __init__(self,
                  start_state,
@@ -64,7 +280,12 @@ class AdaRRT():
                  ada_collision_constraint=None,
                  step_size=0.25,
                  goal_precision=0.2,
-                 max_iter=10000):
+                 sample_near_goal_prob=0.2,
+                 sample_near_goal_range=0.05,
+                 sampler='sobol',
+                 max_iter=10000,
+                 collision_resolution=0.05,
+                 seed=None):
         """
         :param start_state: Array representing the starting state.
         :param goal_state: Array representing the goal state.
@@ -74,21 +295,59 @@ class AdaRRT():
         :param ada_collision_constraint: Collision constraint object.
         :param step_size: Distance between nodes in the RRT.
         :param goal_precision: Maximum distance between RRT and goal before
-            declaring completion.
-        :param sample_near_goal_prob:
-        :param sample_near_goal_range:
+            declaring completion. Only used by build().
+        :param sample_near_goal_prob: Probability of sampling near the goal
+            instead of the whole search space.
+        :param sample_near_goal_range: Half width of the box around the goal
+            that near-goal samples are drawn from.
+        :param sampler: Sequence the search space is sampled from, either
+            'sobol' (scrambled low-discrepancy points) or 'uniform'.
         :param max_iter: Maximum number of iterations to run the RRT before
             failure.
+        :param collision_resolution: Maximum distance between consecutive
+            states checked for collision along an edge of the RRT.
+        :param seed: Seed for the random number generator that draws (and
+            scrambles) the samples, for reproducible runs. Defaults to fresh
+            entropy from the OS.
         """
-        self.start = AdaRRT.Node(start_state, None)
-        self.goal = AdaRRT.Node(goal_state, None)
+        self.start_state = np.asarray(start_state, dtype=np.float64)
+        self.goal_state = np.asarray(goal_state, dtype=np.float64)
         self.ada = ada
         self.joint_lower_limits = joint_lower_limits or AdaRRT.joint_lower_limits
         self.joint_upper_limits = joint_upper_limits or AdaRRT.joint_upper_limits
         self.ada_collision_constraint = ada_collision_constraint
+        # invariant handles passed to every collision check, and the check
+        # itself bound once so each check is a single call into adapy; ada is
+        # only needed when there is a constraint to check
+        self._state_space = None
+        self._skeleton = None
+        self._is_satisfied = None
+        if ada_collision_constraint is not None:
+            self._state_space = ada.get_arm_state_space()
+            self._skeleton = ada.get_arm_skeleton()
+            self._is_satisfied = ada_collision_constraint.is_satisfied
         self.step_size = step_size
         self.goal_precision = goal_precision
+        self.sample_near_goal_prob = sample_near_goal_prob
+        self.sample_near_goal_range = sample_near_goal_range
+        if sampler not in ('sobol', 'uniform'):
+            raise ValueError("Unknown sampler '{}'".format(sampler))
+        self.sampler = sampler
         self.max_iter = max_iter
+        self.collision_resolution = collision_resolution
+        self._steer = _steer6 if self.start_state.shape[0] == 6 else _steer
+        self.tree = AdaRRT.Tree(self.start_state)
+
+        # samples are drawn sample_batch_size at a time and handed out one
+        # per iteration
+        self._rng = np.random.default_rng(seed)
+        self._sobol = None
+        if sampler == 'sobol':
+            self._sobol = qmc.Sobol(d=self.start_state.shape[0],
+                                    scramble=True, seed=self._rng)
+        self._sample_buffer = np.empty(
+            (AdaRRT.sample_batch_size, self.start_state.shape[0]))
+        self._sample_index = AdaRRT.sample_batch_size
 
     def build(self):
         """
@@ -104,65 +363,138 @@ class AdaRRT():
         Once the RRT is complete, add the goal node to the RRT and build a path
         from start to goal.
 
-        :returns: A list of states that create a path from start to
+        :returns: An array of states that create a path from start to
             goal on success. On failure, returns None.
         """
         for k in range(self.max_iter):
             # FILL in your code here
-            # sample = self._get_random_sample()
-            number = np.random.rand()
-            if number <= 0.2:
-                sample = self._get_random_sample_near_goal()
-            else:
-                sample = self._get_random_sample()
+            sample = self._get_sample()
             neighbor = self._get_nearest_neighbor(sample)
             new_node = self._extend_sample(sample, neighbor)
             # print("Sample: " + str(sample))
             # print("NearestNeighbor: " + str(neighbor))
             # print("NewNode: " + str(new_node))
 
-            if new_node and self._check_for_completion(new_node):
+            if new_node is not None and self._check_for_completion(new_node):
                 # FILL in your code here
-                self.goal = new_node.add_child(self.goal.state)#add goal node to the RRT
-                path = self._trace_path_from_start()
+                goal = self.tree.add_node(self.goal_state, new_node)#add goal node to the RRT
+                path = self._trace_path_from_start(goal)
                 print("Path: " + str(path))
                 return path
 
         print("Failed to find path from {0} to {1} after {2} iterations!".format(
-            self.start.state, self.goal.state, self.max_iter))
+            self.start_state, self.goal_state, self.max_iter))
         return None
 
-    def _get_random_sample(self):
+    def build_connect(self):
         """
-        Uniformly samples the search space.
+        Build a path with RRT-Connect.
+
+        Grows one tree from the start (self.tree) and one from the goal. In
+        each step:
+            1. Sample a random point.
+            2. Extend the active tree towards it from its nearest neighbor.
+            3. If we have created a new node, greedily extend the other tree
+                towards that node until it reaches it or collides.
+            4. Swap the roles of the two trees.
 
+        Once step 3 reaches the new node the trees are connected, and the
+        path is the start tree's path to the connection followed by the goal
+        tree's path back to the goal. The path ends exactly at the goal, so
+        goal_precision is ignored.
+
+        :returns: An array of states that create a path from start to
+            goal on success. On failure, returns None.
+        """
+        start_tree = self.tree
+        goal_tree = AdaRRT.Tree(self.goal_state)
+        tree_a, tree_b = start_tree, goal_tree
+        for k in range(self.max_iter):
+            sample = self._get_sample()
+            new_a = self._extend_sample(sample, tree_a.nearest(sample), tree_a)
+            if new_a is not None:
+                new_b = self._connect(tree_b, tree_a.states[new_a])
+                if new_b is not None:
+                    if tree_a is start_tree:
+                        start_node, goal_node = new_a, new_b
+                    else:
+                        start_node, goal_node = new_b, new_a
+                    # both halves end at the connecting state, so it is only
+                    # kept once
+                    path = np.concatenate(
+                        (start_tree.path_to(start_node),
+                         goal_tree.path_to(goal_node)[-2::-1]))
+                    print("Path: " + str(path))
+                    return path
+            tree_a, tree_b = tree_b, tree_a
+
+        print("Failed to find path from {0} to {1} after {2} iterations!".format(
+            self.start_state, self.goal_state, self.max_iter))
+        return None
+
+    def _get_sample(self):
+        """
+        Hands out the next sample of the current batch, drawing a new batch
+        when it is used up. A sample_near_goal_prob fraction of each batch is
+        replaced by samples near the goal. The batch size is a power of two,
+        which keeps the balance properties of Sobol points.
+
+        :returns: A vector representing a randomly sampled point in the search
+            space. It is a view into the batch and is overwritten when the
+            next batch is drawn.
+        """
+        if self._sample_index == self._sample_buffer.shape[0]:
+            batch_size = self._sample_buffer.shape[0]
+            near_goal = (self._rng.random(batch_size)
+                         < self.sample_near_goal_prob)
+            self._sample_buffer[:] = self._get_random_sample(batch_size)
+            self._sample_buffer[near_goal] = \
+                self._get_random_sample_near_goal(np.count_nonzero(near_goal))
+            self._sample_index = 0
+
+        sample = self._sample_buffer[self._sample_index]
+        self._sample_index += 1
+        return sample
+
+    def _get_random_sample(self, size=None):
+        """
+        Samples the search space with self.sampler.
+
+        With the 'sobol' sampler, size=None draws a single point, after
+        which the sequence is no longer at a power-of-two count and later
+        batches lose their balance properties. Do not use it alongside
+        _get_sample.
+
+        :param size: Number of samples to draw, or None for a single sample.
         :returns: A vector representing a randomly sampled point in the search
-            space.
+            space, or a (size, dim) array of them.
         """
         # FILL in your code here
-        sample = copy.copy(self.joint_lower_limits)
+        if self.sampler == 'sobol':
+            sample = qmc.scale(self._sobol.random(1 if size is None else size),
+                               self.joint_lower_limits,
+                               self.joint_upper_limits)
+            return sample[0] if size is None else sample
 
-        for i in range(len(self.joint_lower_limits)):
-            limitation = np.arange(self.joint_lower_limits[i], self.joint_upper_limits[i], 0.01)
-            sample[i] = np.random.choice(limitation)
-        dist = np.linalg.norm(sample - self.start.state)
-        # print("Norm From Start to Sample: " + str(dist))
+        shape = None if size is None else (size, self.start_state.shape[0])
+        sample = self._rng.uniform(self.joint_lower_limits,
+                                   self.joint_upper_limits, shape)
 
         return sample
 
-    def _get_random_sample_near_goal(self):
+    def _get_random_sample_near_goal(self, size=None):
         """
-        Uniformly samples the search space.
+        Uniformly samples the search space near the goal.
 
+        :param size: Number of samples to draw, or None for a single sample.
         :returns: A vector representing a randomly sampled point in the search
-            space.
+            space, or a (size, dim) array of them.
         """
         # FILL in your code here
-        sample = copy.copy(self.joint_lower_limits)
-
-        for i in range(len(self.joint_lower_limits)):
-            limitation = np.arange(self.goal.state[i] - 0.05, self.goal.state[i] + 0.05, 0.01)
-            sample[i] = np.random.choice(limitation)
+        shape = None if size is None else (size, self.goal_state.shape[0])
+        sample_range = self.sample_near_goal_range
+        sample = self._rng.uniform(self.goal_state - sample_range,
+                                   self.goal_state + sample_range, shape)
 
         return sample
 
@@ -172,97 +504,83 @@ class AdaRRT():
         excluding the goal node.
 
         :param sample: The target point to find the closest neighbor to.
-        :returns: A Node object for the closest neighbor.
+        :returns: index of the closest neighbor in self.tree.
         """
         # FILL in your code here
-        # all nodes in the tree
-        nodes = list(self.start)
-        
-        # # distance between each node and sample
-        # dist = [np.linalg.norm(nodes[i].state - sample.state) for i in range(len(node))]
-
-        # # index of nearest neighbour
-        # nearest_neighbour_indx = np.argsort(dist)[0]
-
-        # # nearest neighbour node in tree
-        # nearest_neighbour = nodes[nearest_neighbour_indx]
+        return self.tree.nearest(sample)
 
-        nearest_neighbour = None
-        min_dist = float('inf')
-
-        for node in nodes:
-            dist = np.linalg.norm(node.state - sample)
-            if dist < min_dist:
-                nearest_neighbour = node
-                min_dist = dist
-                # print(min_dist)
-        
-        return nearest_neighbour
-
-    def _extend_sample(self, sample, neighbor):
+    def _extend_sample(self, sample, neighbor, tree=None):
         """
         Adds a new node to the RRT between neighbor and sample, at a distance
         step_size away from neighbor. The new node is only created if it will
-        not collide with any of the collision objects (see
-        RRT._check_for_collision)
+        not collide with any of the collision objects along the edge from
+        neighbor (see RRT._check_edge_collision)
 
         :param sample: target point
-        :param neighbor: closest existing node to sample
-        :returns: The new Node object. On failure (collision), returns None.
+        :param neighbor: index of the closest existing node to sample
+        :param tree: Tree to extend. Defaults to self.tree
+        :returns: index of the new node. On failure (collision), returns None.
         """
         # FILL in your code here
-        direction = sample - neighbor.state
-        distance = np.linalg.norm(direction)
-
-
-        if distance <= self.step_size:
-            new_state = sample
-        else:
-            direction_unit = direction / distance
-            new_state = neighbor.state + direction_unit * self.step_size
-
-        print("Distance: " + str(distance))
-        if not self._check_for_collision(new_state):
-            new_node = neighbor.add_child(new_state)
+        if tree is None:
+            tree = self.tree
+        # steer straight into the tree's next free row; it only becomes a
+        # node if add_node is called
+        new_state = tree.next_state()
+        neighbor_state = tree.states[neighbor]
+        dist_sq = self._steer(neighbor_state, sample, self.step_size, new_state)
+
+        logger.debug("Squared distance: %s", dist_sq)
+        if not self._check_edge_collision(neighbor_state, new_state):
+            new_node = tree.add_node(new_state, neighbor)
             return new_node
         else:
             return None
 
+    def _connect(self, tree, target):
+        """
+        Repeatedly extends tree towards target from its nearest neighbor
+        until it reaches target or an extension collides.
+
+        :param tree: Tree to extend.
+        :param target: np.array of the state to connect to.
+        :returns: index of the new node at target. If an extension collides
+            first, returns None.
+        """
+        node = tree.nearest(target)
+        step_size_sq = self.step_size * self.step_size
+        while True:
+            diff = target - tree.states[node]
+            reached = np.dot(diff, diff) <= step_size_sq
+            node = self._extend_sample(target, node, tree)
+            if node is None or reached:
+                return node
+
     def _check_for_completion(self, node):
         """
         Check whether node is within self.goal_precision distance of the goal.
 
-        :param node: The target Node
+        :param node: index of the target node
         :returns: Boolean indicating node is close enough for completion.
         """
         # FILL in your code here
-        length = np.linalg.norm(self.goal.state - node.state)
-        print("Length: " + str(length))
-        if length <= self.goal_precision: 
+        diff = self.goal_state - self.tree.states[node]
+        length_sq = np.dot(diff, diff)
+        logger.debug("Squared length: %s", length_sq)
+        if length_sq <= self.goal_precision * self.goal_precision:
             return True
         return False
 
-    def _trace_path_from_start(self, node=None):
+    def _trace_path_from_start(self, node):
         """
-        Traces a path from start to node, if provided, or the goal otherwise.
+        Traces a path from start to node.
 
-        :param node: The target Node at the end of the path. Defaults to
-            self.goal
-        :returns: A list of states (not Nodes!) beginning at the start state and
-            ending at the goal state.
+        :param node: index of the target node at the end of the path.
+        :returns: A (length, dim) array of states (not node indices!)
+            beginning at the start state and ending at node's state.
         """
         # FILL in your code here
-        path = []
-        if node == None:
-            node = self.goal
-        i = 0
-        while node != None:
-            path.append(node.state)
-            node = node.parent
-            i = i + 1
-            print("Path before return: "  + str(path) + "  index:  "+ str(i))
-
-        return path[::-1]
+        return self.tree.path_to(node)
 
     def _check_for_collision(self, sample):
         """
@@ -270,11 +588,34 @@ class AdaRRT():
 
         :returns: A boolean value indicating that sample is in collision.
         """
+        if self._is_satisfied is None:
+            return False
+        return self._is_satisfied(self._state_space, self._skeleton, sample)
+
+    def _check_edge_collision(self, state_from, state_to):
+        """
+        Checks if the straight edge between two states is in collision.
+
+        The edge is discretized at self.collision_resolution and the states
+        are checked in bisection order (end state, midpoint, quarter points,
+        ...), stopping at the first collision. Colliding edges usually hit
+        the obstacle well away from state_from, so this rejects them after
+        far fewer checks than a linear sweep. state_from is assumed to be
+        collision free already.
+
+        :param state_from: np.array of the state the edge starts at.
+        :param state_to: np.array of the state the edge ends at.
+        :returns: A boolean value indicating that the edge is in collision.
+        """
         if self.ada_collision_constraint is None:
             return False
-        return self.ada_collision_constraint.is_satisfied(
-            self.ada.get_arm_state_space(),
-            self.ada.get_arm_skeleton(), sample)
+        distance = np.linalg.norm(state_to - state_from)
+        num_states = max(int(np.ceil(distance / self.collision_resolution)), 1)
+        states = np.linspace(state_from, state_to, num_states + 1)[1:]
+        for i in _bisection_order(num_states):
+            if self._check_for_collision(states[i]):
+                return True
+        return False
 
 
 def main(is_sim):
@@ -286,15 +627,12 @@ def main(is_sim):
     # instantiate an ada
     ada = adapy.Ada(is_sim)
 
-    armHome = [-1.5, 3.22, 1.23, -2.19, 1.8, 1.2]
-    goalConfig = [-1.72, 4.44, 2.02, -2.04, 2.66, 1.39]
     delta = 0.25
-    eps = 1.0
 
     if is_sim:
-        ada.set_positions(goalConfig)
+        ada.set_positions(GOAL_CONFIG)
     else:
-        raw_input("Please move arm to home position with the joystick. " +
+        input("Please move arm to home position with the joystick. " +
             "Press ENTER to continue...")
 
 
@@ -322,36 +660,34 @@ def main(is_sim):
 
     # easy goal
     adaRRT = AdaRRT(
-        start_state=np.array(armHome),
-        goal_state=np.array(goalConfig),
+        start_state=ARM_HOME,
+        goal_state=GOAL_CONFIG,
         ada=ada,
         ada_collision_constraint=full_collision_constraint,
-        step_size=delta,
-        goal_precision=eps)
+        step_size=delta)
 
     rospy.sleep(1.0)
 
     if not is_sim:
         ada.start_trajectory_executor()
 
-    path = adaRRT.build()
+    path = adaRRT.build_connect()
     if path is not None:
+        path = np.asarray(path)
         print("Path waypoints:")
-        print(np.asarray(path))
-        waypoints = []
-        for i, waypoint in enumerate(path):
-            waypoints.append((0.0 + i, waypoint))
+        print(path)
+
+        waypoints = [(float(i), q) for i, q in enumerate(path)]
 
-        t0 = time.clock()
+        t0 = time.perf_counter_ns()
         # traj = ada.compute_joint_space_path(
         #     ada.get_arm_state_space(), waypoints)
         traj = ada.compute_smooth_joint_space_path(
             ada.get_arm_state_space(), waypoints)
-        t = time.clock() - t0
-        print(str(t) + "seconds elapsed")
-        raw_input('Press ENTER to execute trajectory and exit')
+        t_ns = time.perf_counter_ns() - t0
+        print(f"{t_ns / 1e6:.3f} ms elapsed")
+        input('Press ENTER to execute trajectory and exit')
         ada.execute_trajectory(traj)
-        rospy.sleep(1.0)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()